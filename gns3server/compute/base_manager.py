@@ -49,6 +49,9 @@ from .error import NodeError, ImageMissingError
 
 CHUNK_SIZE = 1024 * 8  # 8KB
 
+# magic_etc and permitted capabilities words of the security.capability extended attribute
+_CAP_STRUCT = struct.Struct("<II")
+
 
 class BaseManager:
 
@@ -58,6 +61,7 @@ class BaseManager:
     """
 
     _convert_lock = None
+    _privileged_access_cache = {}
 
     def __init__(self):
 
@@ -170,10 +174,10 @@ class BaseManager:
         except ValueError:
             raise aiohttp.web.HTTPBadRequest(text="Node ID {} is not a valid UUID".format(node_id))
 
-        if node_id not in self._nodes:
+        node = self._nodes.get(node_id)
+        if node is None:
             raise aiohttp.web.HTTPNotFound(text="Node ID {} doesn't exist".format(node_id))
 
-        node = self._nodes[node_id]
         if project_id:
             if node.project.id != project.id:
                 raise aiohttp.web.HTTPNotFound(text="Project ID {} doesn't belong to node {}".format(project_id, node.name))
@@ -242,8 +246,9 @@ class BaseManager:
         :param node_id: restore a node identifier
         """
 
-        if node_id in self._nodes:
-            return self._nodes[node_id]
+        node = self._nodes.get(node_id)
+        if node is not None:
+            return node
 
         project = ProjectManager.instance().get_project(project_id)
         if node_id and isinstance(node_id, int):
@@ -327,8 +332,7 @@ class BaseManager:
         """
 
         for node in project.nodes:
-            if node.id in self._nodes:
-                del self._nodes[node.id]
+            self._nodes.pop(node.id, None)
 
     async def delete_node(self, node_id):
         """
@@ -346,8 +350,7 @@ class BaseManager:
             if node:
                 node.project.emit("node.deleted", node)
                 await node.project.remove_node(node)
-        if node.id in self._nodes:
-            del self._nodes[node.id]
+        self._nodes.pop(node.id, None)
         return node
 
     @staticmethod
@@ -372,7 +375,28 @@ class BaseManager:
             # we are root, so we should have privileged access.
             return True
 
-        if os.stat(executable).st_uid == 0 and (os.stat(executable).st_mode & stat.S_ISUID or os.stat(executable).st_mode & stat.S_ISGID):
+        executable_stat = os.stat(executable)
+        # the result can only change if the executable is replaced or if its owner, mode or
+        # capabilities are modified, which all update the inode change time.
+        cache_key = (executable, executable_stat.st_ino, executable_stat.st_ctime_ns)
+        privileged_access = BaseManager._privileged_access_cache.get(cache_key)
+        if privileged_access is None:
+            privileged_access = BaseManager._check_privileged_access(executable, executable_stat)
+            BaseManager._privileged_access_cache[cache_key] = privileged_access
+        return privileged_access
+
+    @staticmethod
+    def _check_privileged_access(executable, executable_stat):
+        """
+        Check if an executable has the set UID bit or the CAP_NET_RAW capability.
+
+        :param executable: executable path
+        :param executable_stat: executable stat result
+
+        :returns: True or False
+        """
+
+        if executable_stat.st_uid == 0 and (executable_stat.st_mode & stat.S_ISUID or executable_stat.st_mode & stat.S_ISGID):
             # the executable has set UID bit.
             return True
 
@@ -381,7 +405,7 @@ class BaseManager:
             if sys.platform.startswith("linux") and "security.capability" in os.listxattr(executable):
                 caps = os.getxattr(executable, "security.capability")
                 # test the 2nd byte and check if the 13th bit (CAP_NET_RAW) is set
-                if struct.unpack("<IIIII", caps)[1] & 1 << 13:
+                if _CAP_STRUCT.unpack_from(caps, 0)[1] & (1 << 13):
                     return True
         except (AttributeError, OSError) as e:
             log.error("could not determine if CAP_NET_RAW capability is set for {}: {}".format(executable, e))
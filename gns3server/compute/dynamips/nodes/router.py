@@ -1598,25 +1598,25 @@ class Router(BaseNode):
         if startup_config_base64:
             startup_config = self.startup_config_path
             try:
-                config = base64.b64decode(startup_config_base64).decode("utf-8", errors="replace")
-                config = "!\n" + config.replace("\r", "")
+                config = base64.b64decode(startup_config_base64).replace(b"\r", b"")
                 config_path = os.path.join(self._working_directory, startup_config)
                 with open(config_path, "wb") as f:
                     log.info("saving startup-config to {}".format(startup_config))
-                    f.write(config.encode("utf-8"))
+                    f.write(b"!\n" + config)
             except (binascii.Error, OSError) as e:
                 raise DynamipsError("Could not save the startup configuration {}: {}".format(config_path, e))
 
-        if private_config_base64 and base64.b64decode(private_config_base64) != b'\nkerberos password \nend\n':
-            private_config = self.private_config_path
-            try:
-                config = base64.b64decode(private_config_base64).decode("utf-8", errors="replace")
-                config_path = os.path.join(self._working_directory, private_config)
-                with open(config_path, "wb") as f:
-                    log.info("saving private-config to {}".format(private_config))
-                    f.write(config.encode("utf-8"))
-            except (binascii.Error, OSError) as e:
-                raise DynamipsError("Could not save the private configuration {}: {}".format(config_path, e))
+        if private_config_base64:
+            config = base64.b64decode(private_config_base64)
+            if config != b'\nkerberos password \nend\n':
+                private_config = self.private_config_path
+                try:
+                    config_path = os.path.join(self._working_directory, private_config)
+                    with open(config_path, "wb") as f:
+                        log.info("saving private-config to {}".format(private_config))
+                        f.write(config)
+                except OSError as e:
+                    raise DynamipsError("Could not save the private configuration {}: {}".format(config_path, e))
 
     async def delete(self):
         """
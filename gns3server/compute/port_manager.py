@@ -160,7 +160,7 @@ class PortManager:
 
         last_exception = None
         for port in range(start_port, end_port + 1):
-            if ignore_ports and (port in ignore_ports or port in BANNED_PORTS):
+            if port in BANNED_PORTS or (ignore_ports and port in ignore_ports):
                 continue
 
             try:
@@ -188,7 +188,7 @@ class Project:
         """
 
         workdir = self.module_working_path(module_name)
-        if not self._deleted:
+        if not self._deleted and not os.path.isdir(workdir):
             try:
                 os.makedirs(workdir, exist_ok=True)
             except OSError as e:
@@ -215,7 +215,7 @@ class Project:
         """
 
         workdir = self.node_working_path(node)
-        if not self._deleted:
+        if not self._deleted and not os.path.isdir(workdir):
             try:
                 os.makedirs(workdir, exist_ok=True)
             except OSError as e:
@@ -245,7 +245,7 @@ class Project:
         """
 
         workdir = os.path.join(self._path, "project-files", "captures")
-        if not self._deleted:
+        if not self._deleted and not os.path.isdir(workdir):
             try:
                 os.makedirs(workdir, exist_ok=True)
             except OSError as e:
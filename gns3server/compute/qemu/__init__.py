@@ -180,16 +180,12 @@ class Qemu(BaseManager):
         """
         qemu_imgs = []
         for path in Qemu.paths_list():
-            try:
-                for f in os.listdir(path):
-                    if (f == "qemu-img" or f == "qemu-img.exe") and \
-                            os.access(os.path.join(path, f), os.X_OK) and \
-                            os.path.isfile(os.path.join(path, f)):
-                        qemu_path = os.path.join(path, f)
-                        version = await Qemu._get_qemu_img_version(qemu_path)
-                        qemu_imgs.append({"path": qemu_path, "version": version})
-            except OSError:
-                continue
+            # the binary name is known, check the candidates directly instead of listing the directory
+            for f in ("qemu-img", "qemu-img.exe"):
+                qemu_path = os.path.join(path, f)
+                if os.path.isfile(qemu_path) and os.access(qemu_path, os.X_OK):
+                    version = await Qemu._get_qemu_img_version(qemu_path)
+                    qemu_imgs.append({"path": qemu_path, "version": version})
 
         return qemu_imgs
 
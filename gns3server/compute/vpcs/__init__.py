@@ -21,6 +21,7 @@ VPCS server module.
 
 import os
 import asyncio
+import collections
 
 from ..base_manager import BaseManager
 from .vpcs_error import VPCSError
@@ -45,9 +46,10 @@ class VPCS(BaseManager):
         """
 
         node = await super().create_node(*args, **kwargs)
-        self._free_mac_ids.setdefault(node.project.id, list(range(0, 255)))
+        # free MAC ids are kept in a deque so they can be taken and given back in O(1)
+        self._free_mac_ids.setdefault(node.project.id, collections.deque(range(0, 255)))
         try:
-            self._used_mac_ids[node.id] = self._free_mac_ids[node.project.id].pop(0)
+            self._used_mac_ids[node.id] = self._free_mac_ids[node.project.id].popleft()
         except IndexError:
             raise VPCSError("Cannot create a new VPCS VM (limit of 255 VMs reached on this host)")
         return node
@@ -60,10 +62,9 @@ class VPCS(BaseManager):
         """
 
         node = self.get_node(node_id)
-        if node_id in self._used_mac_ids:
-            i = self._used_mac_ids[node_id]
-            self._free_mac_ids[node.project.id].insert(0, i)
-            del self._used_mac_ids[node_id]
+        i = self._used_mac_ids.pop(node_id, None)
+        if i is not None:
+            self._free_mac_ids[node.project.id].appendleft(i)
         await super().close_node(node_id, *args, **kwargs)
         return node
 
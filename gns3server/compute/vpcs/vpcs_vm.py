@@ -22,6 +22,7 @@ order to run a VPCS VM.
 
 import os
 import sys
+import stat
 import socket
 import subprocess
 import signal
@@ -32,6 +33,7 @@ import shutil
 from gns3server.utils.asyncio import wait_for_process_termination
 from gns3server.utils.asyncio import monitor_process
 from gns3server.utils.asyncio import subprocess_check_output
+from gns3server.utils.asyncio import wait_run_in_executor
 from gns3server.utils import parse_version
 
 from .vpcs_error import VPCSError
@@ -58,6 +60,8 @@ class VPCSVM(BaseNode):
     :param startup_script: content of the startup script file
     """
 
+    _vpcs_version_cache = {}
+
     def __init__(self, name, node_id, project, manager, console=None, console_type="telnet", startup_script=None):
 
         super().__init__(name, node_id, project, manager, console=console, console_type=console_type, wrap_console=True)
@@ -66,6 +70,7 @@ class VPCSVM(BaseNode):
         self._vpcs_version = None
         self._started = False
         self._local_udp_tunnel = None
+        self._bridge_name = "VPCS-{}".format(self._id)
 
         # VPCS settings
         if startup_script is not None and not self.script_file:  # We disallow override at startup
@@ -112,13 +117,24 @@ class VPCSVM(BaseNode):
         # This raise an error if ubridge is not available
         self.ubridge_path
 
-        if not os.path.isfile(path):
+        try:
+            path_stat = os.stat(path)
+        except OSError:
+            path_stat = None
+        if path_stat is None or not stat.S_ISREG(path_stat.st_mode):
             raise VPCSError("VPCS program '{}' is not accessible".format(path))
 
         if not os.access(path, os.X_OK):
             raise VPCSError("VPCS program '{}' is not executable".format(path))
 
-        await self._check_vpcs_version()
+        # only run "vpcs -v" again if the executable has been replaced or modified
+        cache_key = (path, path_stat.st_mtime_ns, path_stat.st_size)
+        vpcs_version = VPCSVM._vpcs_version_cache.get(cache_key)
+        if vpcs_version is None:
+            await self._check_vpcs_version()
+            VPCSVM._vpcs_version_cache[cache_key] = self._vpcs_version
+        else:
+            self._vpcs_version = vpcs_version
 
     def __json__(self):
 
@@ -222,9 +238,9 @@ class VPCSVM(BaseNode):
             nio = self._ethernet_adapter.get_nio(0)
             command = self._build_command()
             try:
-                log.info("Starting VPCS: {}".format(command))
+                log.info("Starting VPCS: %s", command)
                 self._vpcs_stdout_file = os.path.join(self.working_dir, "vpcs.log")
-                log.info("Logging to {}".format(self._vpcs_stdout_file))
+                log.info("Logging to %s", self._vpcs_stdout_file)
                 flags = 0
                 if sys.platform.startswith("win32"):
                     flags = subprocess.CREATE_NEW_PROCESS_GROUP
@@ -239,11 +255,11 @@ class VPCSVM(BaseNode):
 
                 await self._start_ubridge()
                 if nio:
-                    await self.add_ubridge_udp_connection("VPCS-{}".format(self._id), self._local_udp_tunnel[1], nio)
+                    await self.add_ubridge_udp_connection(self._bridge_name, self._local_udp_tunnel[1], nio)
 
                 await self.start_wrap_console()
 
-                log.info("VPCS instance {} started PID={}".format(self.name, self._process.pid))
+                log.info("VPCS instance %s started PID=%s", self.name, self._process.pid)
                 self._started = True
                 self.status = "started"
             except (OSError, subprocess.SubprocessError) as e:
@@ -261,12 +277,12 @@ class VPCSVM(BaseNode):
         if self._started:
             log.info("VPCS process has stopped, return code: %d", returncode)
             self._started = False
-            self.status = "stopped"
             self._process = None
             await self._stop_ubridge()
-            await super().stop()
+            await super().stop()  # sets the status to stopped
             if returncode != 0:
-                self.project.emit("log.error", {"message": "VPCS process has stopped, return code: {}\n{}".format(returncode, self.read_vpcs_stdout())})
+                vpcs_stdout = await wait_run_in_executor(self.read_vpcs_stdout)
+                self.project.emit("log.error", {"message": "VPCS process has stopped, return code: {}\n{}".format(returncode, vpcs_stdout)})
 
     async def stop(self):
         """
@@ -305,7 +321,7 @@ class VPCSVM(BaseNode):
         Terminate the process if running
         """
 
-        log.info("Stopping VPCS instance {} PID={}".format(self.name, self._process.pid))
+        log.info("Stopping VPCS instance %s PID=%s", self.name, self._process.pid)
         if sys.platform.startswith("win32"):
             try:
                 self._process.send_signal(signal.CTRL_BREAK_EVENT)
@@ -378,13 +394,10 @@ class VPCSVM(BaseNode):
                                                                                            port_number=port_number))
 
         if self.is_running():
-            await self.add_ubridge_udp_connection("VPCS-{}".format(self._id), self._local_udp_tunnel[1], nio)
+            await self.add_ubridge_udp_connection(self._bridge_name, self._local_udp_tunnel[1], nio)
 
         self._ethernet_adapter.add_nio(port_number, nio)
-        log.info('VPCS "{name}" [{id}]: {nio} added to port {port_number}'.format(name=self._name,
-                                                                                  id=self.id,
-                                                                                  nio=nio,
-                                                                                  port_number=port_number))
+        log.info('VPCS "%s" [%s]: %s added to port %s', self._name, self.id, nio, port_number)
 
         return nio
 
@@ -400,7 +413,7 @@ class VPCSVM(BaseNode):
             raise VPCSError("Port {port_number} doesn't exist on adapter {adapter}".format(adapter=self._ethernet_adapter,
                                                                                            port_number=port_number))
         if self.is_running():
-            await self.update_ubridge_udp_connection("VPCS-{}".format(self._id), self._local_udp_tunnel[1], nio)
+            await self.update_ubridge_udp_connection(self._bridge_name, self._local_udp_tunnel[1], nio)
 
     async def port_remove_nio_binding(self, port_number):
         """
@@ -417,17 +430,14 @@ class VPCSVM(BaseNode):
 
         await self.stop_capture(port_number)
         if self.is_running():
-            await self._ubridge_send("bridge delete {name}".format(name="VPCS-{}".format(self._id)))
+            await self._ubridge_send("bridge delete {name}".format(name=self._bridge_name))
 
         nio = self._ethernet_adapter.get_nio(port_number)
         if isinstance(nio, NIOUDP):
             self.manager.port_manager.release_udp_port(nio.lport, self._project)
         self._ethernet_adapter.remove_nio(port_number)
 
-        log.info('VPCS "{name}" [{id}]: {nio} removed from port {port_number}'.format(name=self._name,
-                                                                                      id=self.id,
-                                                                                      nio=nio,
-                                                                                      port_number=port_number))
+        log.info('VPCS "%s" [%s]: %s removed from port %s', self._name, self.id, nio, port_number)
         return nio
 
     def get_nio(self, port_number):
@@ -461,12 +471,10 @@ class VPCSVM(BaseNode):
 
         nio.start_packet_capture(output_file)
         if self.ubridge:
-            await self._ubridge_send('bridge start_capture {name} "{output_file}"'.format(name="VPCS-{}".format(self._id),
+            await self._ubridge_send('bridge start_capture {name} "{output_file}"'.format(name=self._bridge_name,
                                                                                                output_file=output_file))
 
-        log.info("VPCS '{name}' [{id}]: starting packet capture on port {port_number}".format(name=self.name,
-                                                                                              id=self.id,
-                                                                                              port_number=port_number))
+        log.info("VPCS '%s' [%s]: starting packet capture on port %s", self.name, self.id, port_number)
 
     async def stop_capture(self, port_number):
         """
@@ -481,11 +489,9 @@ class VPCSVM(BaseNode):
 
         nio.stop_packet_capture()
         if self.ubridge:
-            await self._ubridge_send('bridge stop_capture {name}'.format(name="VPCS-{}".format(self._id)))
+            await self._ubridge_send('bridge stop_capture {name}'.format(name=self._bridge_name))
 
-        log.info("VPCS '{name}' [{id}]: stopping packet capture on port {port_number}".format(name=self.name,
-                                                                                              id=self.id,
-                                                                                              port_number=port_number))
+        log.info("VPCS '%s' [%s]: stopping packet capture on port %s", self.name, self.id, port_number)
 
     def _build_command(self):
         """
@@ -301,6 +301,9 @@ class GNS3VM:
             except GNS3VMError as e:
                 log.warning(str(e))
 
+        for engine in self._engines.values():
+            await engine.close()
+
     @locking
     async def start(self):
         """
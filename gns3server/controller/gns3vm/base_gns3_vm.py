@@ -301,3 +301,10 @@ class BaseGNS3VM:
         """
 
         raise NotImplementedError
+
+    async def close(self):
+        """
+        Releases the resources used to manage the GNS3 VM.
+        """
+
+        pass
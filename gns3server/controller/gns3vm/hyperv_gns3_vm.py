@@ -16,8 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import sys
+import time
+import contextlib
 import logging
 import asyncio
+import threading
+import concurrent.futures
 import psutil
 import ipaddress
 
@@ -25,17 +29,52 @@ from .base_gns3_vm import BaseGNS3VM
 from .gns3_vm_error import GNS3VMError
 log = logging.getLogger(__name__)
 
+# the Windows version cannot change while the server is running
+if sys.platform.startswith("win"):
+    _WINDOWS_VERSION = sys.getwindowsversion().platform_version
+else:
+    _WINDOWS_VERSION = None
+
+
+def _init_wmi_thread():
+    """
+    Initializes COM in the thread running the WMI calls.
+    """
+
+    if _WINDOWS_VERSION is not None:
+        import pythoncom
+        pythoncom.CoInitialize()
+
 
 class HyperVGNS3VM(BaseGNS3VM):
 
+    # BaseGNS3VM does not define __slots__ so instances keep a __dict__ for the inherited attributes
+    __slots__ = ("_conn", "_vm", "_management", "_wmi", "_conn_cache", "_wmi_executor",
+                 "_enabled_state", "_state_watcher", "_state_watcher_vm", "_state_watcher_stop")
+
     _HYPERV_VM_STATE_ENABLED = 2
     _HYPERV_VM_STATE_DISABLED = 3
     _HYPERV_VM_STATE_SHUTDOWN = 4
     _HYPERV_VM_STATE_PAUSED = 9
 
+    _STATE_CHANGE_TIMEOUT = 300  # seconds
+    _POLL_INTERVAL = 0.005  # initial polling interval in seconds
+    _POLL_MAX_INTERVAL = 1.0  # maximum polling interval in seconds
+
     _WMI_JOB_STATUS_STARTED = 4096
-    _WMI_JOB_STATE_RUNNING = 4
+    _WMI_SYNC_SUCCESS = frozenset({0, 32775})  # completed or already in the requested state
     _WMI_JOB_STATE_COMPLETED = 7
+    _WMI_JOB_STATE_TERMINATED = 8
+    _WMI_JOB_STATE_KILLED = 9
+    _WMI_JOB_STATE_EXCEPTION = 10
+    _WMI_JOB_FINISHED_STATES = (_WMI_JOB_STATE_COMPLETED,
+                                _WMI_JOB_STATE_TERMINATED,
+                                _WMI_JOB_STATE_KILLED,
+                                _WMI_JOB_STATE_EXCEPTION)
+
+    # the requirements and the number of physical cores cannot change while the server is running
+    _requirements_ok = False
+    _physical_cpus = None
 
     def __init__(self, controller):
 
@@ -45,55 +84,91 @@ class HyperVGNS3VM(BaseGNS3VM):
         self._vm = None
         self._management = None
         self._wmi = None
+        self._conn_cache = {}
+
+        # VM state mirrored from WMI events
+        self._enabled_state = None
+        self._state_watcher = None
+        self._state_watcher_vm = None
+        self._state_watcher_stop = None
+
+        # WMI objects are bound to the thread that created them, all the blocking
+        # WMI calls are made from a single thread to keep the event loop responsive.
+        self._wmi_executor = None
 
     def _check_requirements(self):
         """
         Checks if the GNS3 VM can run on Hyper-V.
         """
 
-        if not sys.platform.startswith("win"):
+        if _WINDOWS_VERSION is None:
             raise GNS3VMError("Hyper-V is only supported on Windows")
 
-        if sys.getwindowsversion().platform_version[0] < 10:
-            raise GNS3VMError("Windows 10/Windows Server 2016 or a later version is required to run Hyper-V with nested virtualization enabled (version {} detected)".format(sys.getwindowsversion().platform_version[0]))
+        if _WINDOWS_VERSION[0] < 10:
+            raise GNS3VMError("Windows 10/Windows Server 2016 or a later version is required to run Hyper-V with nested virtualization enabled (version {} detected)".format(_WINDOWS_VERSION[0]))
 
-        is_windows_10 = sys.getwindowsversion().platform_version[0] == 10 and sys.getwindowsversion().platform_version[1] == 0
+        is_windows_10 = _WINDOWS_VERSION[0] == 10 and _WINDOWS_VERSION[1] == 0
 
-        if is_windows_10 and sys.getwindowsversion().platform_version[2] < 14393:
+        if is_windows_10 and _WINDOWS_VERSION[2] < 14393:
             raise GNS3VMError("Hyper-V with nested virtualization is only supported on Windows 10 Anniversary Update (build 10.0.14393) or later")
 
+        import wmi
+        self._wmi = wmi
+
+        if HyperVGNS3VM._requirements_ok:
+            return
+
         try:
-            import pythoncom
-            pythoncom.CoInitialize()
-            import wmi
-            self._wmi = wmi
-            conn = self._wmi.WMI()
+            conn = self._get_wmi_conn(r"root\cimv2")
         except self._wmi.x_wmi as e:
             raise GNS3VMError("Could not connect to WMI: {}".format(e))
 
         if not conn.Win32_ComputerSystem()[0].HypervisorPresent:
             raise GNS3VMError("Hyper-V is not installed or activated")
 
-        if conn.Win32_Processor()[0].Manufacturer != "GenuineIntel":
-            if is_windows_10 and conn.Win32_Processor()[0].Manufacturer == "AuthenticAMD":
-                if sys.getwindowsversion().platform_version[2] < 19640:
+        processor = conn.Win32_Processor()[0]
+        if processor.Manufacturer != "GenuineIntel":
+            if is_windows_10 and processor.Manufacturer == "AuthenticAMD":
+                if _WINDOWS_VERSION[2] < 19640:
                     raise GNS3VMError("Windows 10 (build 10.0.19640) or later is required by Hyper-V to support nested virtualization with AMD processors")
             else:
                 raise GNS3VMError("An Intel processor is required by Hyper-V to support nested virtualization on this version of Windows")
 
         # This is not reliable
-        #if not conn.Win32_Processor()[0].VirtualizationFirmwareEnabled:
+        #if not processor.VirtualizationFirmwareEnabled:
         #    raise GNS3VMError("Nested Virtualization (VT-x) is not enabled on this system")
 
+        HyperVGNS3VM._requirements_ok = True
+
+    async def _wmi_call(self, func, *args):
+        """
+        Runs a blocking WMI call in the WMI thread.
+
+        :param func: function to run
+        :param args: function arguments
+
+        :returns: function result
+        """
+
+        if self._wmi_executor is None:
+            self._wmi_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1,
+                                                                       thread_name_prefix="hyperv-wmi",
+                                                                       initializer=_init_wmi_thread)
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._wmi_executor, func, *args)
+
     def _connect(self):
         """
         Connects to local host using WMI.
         """
 
+        if self._conn is not None and self._management is not None:
+            return
+
         self._check_requirements()
 
         try:
-            self._conn = self._wmi.WMI(namespace=r"root\virtualization\v2")
+            self._conn = self._get_wmi_conn(r"root\virtualization\v2")
         except self._wmi.x_wmi as e:
             raise GNS3VMError("Could not connect to WMI: {}".format(e))
 
@@ -107,8 +182,7 @@ class HyperVGNS3VM(BaseGNS3VM):
         Finds a Hyper-V VM.
         """
 
-        if self._conn is None:
-            self._connect()
+        self._connect()
         vms = self._conn.Msvm_ComputerSystem(ElementName=vm_name)
         nb_vms = len(vms)
         if nb_vms == 0:
@@ -123,10 +197,89 @@ class HyperVGNS3VM(BaseGNS3VM):
         Checks if the VM is running.
         """
 
-        if self._vm is not None and self._vm.EnabledState == HyperVGNS3VM._HYPERV_VM_STATE_ENABLED:
+        if self._vm is not None and self._enabled_state == HyperVGNS3VM._HYPERV_VM_STATE_ENABLED:
             return True
         return False
 
+    def _get_vm_state(self):
+        """
+        Gets the VM identifier and its current state.
+
+        :returns: tuple (VM GUID, enabled state)
+        """
+
+        return self._vm.Name, self._vm.EnabledState
+
+    def _vm_state_watcher(self, vm_guid, stop_event):
+        """
+        Mirrors the VM state using a WMI event subscription.
+        This is blocking and must be run in a dedicated thread.
+
+        :param vm_guid: VM GUID
+        :param stop_event: event to stop watching
+        """
+
+        try:
+            with self._thread_wmi_conn(r"root\virtualization\v2") as conn:
+                wql = "SELECT * FROM __InstanceModificationEvent WITHIN 1 WHERE TargetInstance ISA 'Msvm_ComputerSystem' " \
+                      "AND TargetInstance.Name='{}'".format(vm_guid)
+                watcher = conn.watch_for(raw_wql=wql)
+                # the state may have changed before the subscription was registered
+                vms = conn.Msvm_ComputerSystem(Name=vm_guid)
+                if not vms:
+                    log.warning("Could not watch the state of Hyper-V VM {}: the VM does not exist anymore".format(vm_guid))
+                    self._enabled_state = None
+                    return
+                self._enabled_state = vms[0].EnabledState
+                while not stop_event.is_set():
+                    try:
+                        vm = watcher(timeout_ms=1000)
+                    except self._wmi.x_wmi_timed_out:
+                        continue
+                    if vm.EnabledState != self._enabled_state:
+                        # the event may have been queued before a state change requested by _set_state(),
+                        # only trust the current state of the VM.
+                        vms = conn.Msvm_ComputerSystem(Name=vm_guid)
+                        self._enabled_state = vms[0].EnabledState if vms else None
+        except self._wmi.x_wmi as e:
+            log.warning("Could not watch the state of Hyper-V VM {}: {}".format(vm_guid, e))
+
+    async def _watch_vm_state(self):
+        """
+        Starts mirroring the VM state, unless it is already watched.
+        """
+
+        # the VM is identified by its GUID because a VM re-imported with the same name gets a new one
+        vm_guid, enabled_state = await self._wmi_call(self._get_vm_state)
+        if self._state_watcher is not None and self._state_watcher.is_alive() and self._state_watcher_vm == vm_guid:
+            # the VM object has just been fetched, its state is the most recent one
+            self._enabled_state = enabled_state
+            return
+        await self._stop_vm_state_watcher()
+        # set after the previous watcher has stopped so it cannot overwrite the state
+        self._enabled_state = enabled_state
+        self._state_watcher_vm = vm_guid
+        self._state_watcher_stop = threading.Event()
+        # daemon thread so the watcher cannot keep the server alive if close() is never called
+        self._state_watcher = threading.Thread(target=self._vm_state_watcher,
+                                               args=(vm_guid, self._state_watcher_stop),
+                                               name="hyperv-vm-state",
+                                               daemon=True)
+        self._state_watcher.start()
+
+    async def _stop_vm_state_watcher(self):
+        """
+        Stops mirroring the VM state.
+        """
+
+        if self._state_watcher is not None:
+            self._state_watcher_stop.set()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self._state_watcher.join)
+            self._state_watcher = None
+            self._state_watcher_vm = None
+            self._state_watcher_stop = None
+
     def _get_vm_setting_data(self, vm):
         """
         Gets the VM settings.
@@ -156,77 +309,193 @@ class HyperVGNS3VM(BaseGNS3VM):
         :param ram: amount of RAM
         """
 
-        available_vcpus = psutil.cpu_count(logical=False)
+        if HyperVGNS3VM._physical_cpus is None:
+            HyperVGNS3VM._physical_cpus = psutil.cpu_count(logical=False)
+        available_vcpus = HyperVGNS3VM._physical_cpus
         if vcpus > available_vcpus:
             raise GNS3VMError("You have allocated too many vCPUs for the GNS3 VM! (max available is {} vCPUs)".format(available_vcpus))
 
         try:
-            mem_settings = self._get_vm_resources(self._vm, 'Msvm_MemorySettingData')[0]
-            cpu_settings = self._get_vm_resources(self._vm, 'Msvm_ProcessorSettingData')[0]
+            # get the memory and processor settings with a single associators query
+            mem_settings = cpu_settings = None
+            for resource in self._get_vm_setting_data(self._vm).associators():
+                resource_class = resource.Path_.Class
+                if resource_class == 'Msvm_MemorySettingData' and mem_settings is None:
+                    mem_settings = resource
+                elif resource_class == 'Msvm_ProcessorSettingData' and cpu_settings is None:
+                    cpu_settings = resource
+            if mem_settings is None or cpu_settings is None:
+                raise GNS3VMError("Could not find the memory and processor settings")
+
+            # uint64 WMI properties are returned as strings
+            mem_configured = (int(mem_settings.VirtualQuantity), int(mem_settings.Reservation), int(mem_settings.Limit))
+            cpu_configured = (int(cpu_settings.VirtualQuantity), int(cpu_settings.Reservation), int(cpu_settings.Limit))
+            if mem_configured == (ram, ram, ram) and cpu_configured == (vcpus, vcpus, 100000) \
+                    and cpu_settings.ExposeVirtualizationExtensions:
+                log.info("GNS3 VM vCPU count and RAM amount are already set to {} and {}".format(vcpus, ram))
+                return
 
             mem_settings.VirtualQuantity = ram
             mem_settings.Reservation = ram
             mem_settings.Limit = ram
-            self._management.ModifyResourceSettings(ResourceSettings=[mem_settings.GetText_(1)])
 
             cpu_settings.VirtualQuantity = vcpus
             cpu_settings.Reservation = vcpus
             cpu_settings.Limit = 100000  # use 100% of CPU
             cpu_settings.ExposeVirtualizationExtensions = True  # allow the VM to use nested virtualization
-            self._management.ModifyResourceSettings(ResourceSettings=[cpu_settings.GetText_(1)])
+
+            # apply both settings in one call
+            self._management.ModifyResourceSettings(ResourceSettings=[mem_settings.GetText_(1), cpu_settings.GetText_(1)])
 
             log.info("GNS3 VM vCPU count set to {} and RAM amount set to {}".format(vcpus, ram))
         except Exception as e:
             raise GNS3VMError("Could not set to {} and RAM amount set to {}: {}".format(vcpus, ram, e))
 
-    async def list(self):
+    def _list_vms(self):
         """
-        List all Hyper-V VMs
+        Gets the names of all Hyper-V VMs.
         """
 
-        if self._conn is None or self._management is None:
-            self._connect()
+        self._connect()
 
-        vms = []
         try:
-            for vm in self._conn.Msvm_ComputerSystem():
-                if vm.ElementName != self._management.SystemName:
-                    vms.append({"vmname": vm.ElementName})
+            # only request the VM names, the host is excluded by its name (Caption is localized)
+            host_name = self._management.SystemName.replace("\\", "\\\\").replace("'", "\\'")
+            wql = "SELECT ElementName FROM Msvm_ComputerSystem WHERE ElementName <> '{}'".format(host_name)
+            return [{"vmname": vm.ElementName} for vm in self._conn.query(wql)]
         except self._wmi.x_wmi as e:
             raise GNS3VMError("Could not list Hyper-V VMs: {}".format(e))
-        return vms
 
-    def _get_wmi_obj(self, path):
+    async def list(self):
         """
-        Gets the WMI object.
+        List all Hyper-V VMs
         """
 
-        return self._wmi.WMI(moniker=path.replace('\\', '/'))
+        return await self._wmi_call(self._list_vms)
 
-    async def _set_state(self, state):
+    def _get_wmi_conn(self, namespace):
         """
-        Set the desired state of the VM
+        Gets a cached WMI connection to a namespace.
+
+        :param namespace: WMI namespace
+
+        :returns: WMI connection
+        """
+
+        conn = self._conn_cache.get(namespace)
+        if conn is None:
+            conn = self._conn_cache[namespace] = self._wmi.WMI(namespace=namespace)
+        return conn
+
+    @staticmethod
+    def _split_wmi_path(path):
+        """
+        Splits a WMI object path (e.g. \\\\HOST\\root\\virtualization\\v2:Msvm_ConcreteJob.InstanceID="...")
+
+        :param path: WMI object path
+
+        :returns: tuple (namespace, relative path)
+        """
+
+        namespace, rel_path = path.split(":", 1)
+        if namespace.startswith("\\\\"):
+            # remove the server part
+            namespace = namespace[2:].split("\\", 1)[1]
+        return namespace, rel_path
+
+    @contextlib.contextmanager
+    def _thread_wmi_conn(self, namespace):
+        """
+        Opens a WMI connection for the current thread.
+        WMI objects cannot be shared between threads, so COM is initialized
+        and a dedicated connection is opened for the thread.
+
+        :param namespace: WMI namespace
+
+        :returns: WMI connection
+        """
+
+        import pythoncom
+        pythoncom.CoInitialize()
+        try:
+            yield self._wmi.WMI(namespace=namespace)
+        finally:
+            pythoncom.CoUninitialize()
+
+    def _wait_for_job(self, job_path, timeout, stop_event):
+        """
+        Waits for a WMI job to finish using a WMI event subscription.
+        This is blocking and must be run in an executor.
+
+        :param job_path: WMI path of the job
+        :param timeout: timeout in seconds
+        :param stop_event: event to stop waiting
+        """
+
+        namespace, rel_path = self._split_wmi_path(job_path)
+        try:
+            with self._thread_wmi_conn(namespace) as conn:
+                job = conn.get(rel_path)
+                wql = "SELECT * FROM __InstanceModificationEvent WITHIN 1 WHERE TargetInstance ISA 'Msvm_ConcreteJob' " \
+                      "AND TargetInstance.InstanceID='{}'".format(job.InstanceID)
+                watcher = conn.watch_for(raw_wql=wql)
+                # the job may have finished before the subscription was registered
+                job = conn.get(rel_path)
+                # wait in short slices so the thread exits soon after the caller gives up
+                deadline = time.monotonic() + timeout
+                while job.JobState not in HyperVGNS3VM._WMI_JOB_FINISHED_STATES:
+                    if stop_event.is_set() or time.monotonic() >= deadline:
+                        raise GNS3VMError("Timeout while waiting for WMI job {}".format(job_path))
+                    try:
+                        job = watcher(timeout_ms=1000)
+                    except self._wmi.x_wmi_timed_out:
+                        continue
+                if job.JobState != HyperVGNS3VM._WMI_JOB_STATE_COMPLETED:
+                    raise GNS3VMError("Error while changing state: {}".format(job.ErrorSummaryDescription))
+        except self._wmi.x_wmi as e:
+            raise GNS3VMError("Could not wait for WMI job {}: {}".format(job_path, e))
+
+    def _request_state_change(self, state):
+        """
+        Requests a state change of the VM.
+
+        :param state: requested state
+
+        :returns: tuple (job path, return code)
         """
 
         if not self._vm:
             self._vm = self._find_vm(self.vmname)
         if not self._vm:
             raise GNS3VMError("Could not find Hyper-V VM {}".format(self.vmname))
-        job_path, ret = self._vm.RequestStateChange(state)
+        return self._vm.RequestStateChange(state)
+
+    async def _set_state(self, state):
+        """
+        Set the desired state of the VM
+        """
+
+        job_path, ret = await self._wmi_call(self._request_state_change, state)
         if ret == HyperVGNS3VM._WMI_JOB_STATUS_STARTED:
-            job = self._get_wmi_obj(job_path)
-            while job.JobState == HyperVGNS3VM._WMI_JOB_STATE_RUNNING:
-                await asyncio.sleep(0.1)
-                job = self._get_wmi_obj(job_path)
-            if job.JobState != HyperVGNS3VM._WMI_JOB_STATE_COMPLETED:
-                raise GNS3VMError("Error while changing state: {}".format(job.ErrorSummaryDescription))
-        elif ret != 0 or ret != 32775:
+            loop = asyncio.get_event_loop()
+            stop_event = threading.Event()
+            try:
+                await asyncio.wait_for(loop.run_in_executor(None, self._wait_for_job, job_path, HyperVGNS3VM._STATE_CHANGE_TIMEOUT, stop_event),
+                                       timeout=HyperVGNS3VM._STATE_CHANGE_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise GNS3VMError("Timeout while changing state to {}".format(state))
+            finally:
+                # the executor thread cannot be cancelled, tell it to stop waiting
+                stop_event.set()
+        elif ret not in HyperVGNS3VM._WMI_SYNC_SUCCESS:
             raise GNS3VMError("Failed to change state to {}".format(state))
 
-    async def _is_vm_network_active(self):
+        # do not wait for the WMI event to update the mirrored state (only compared with the enabled state)
+        self._enabled_state = state
+
+    def _count_vm_nics(self):
         """
-        Check if WMI is updated with VM virtual network adapters
-        and wait until their count becomes > 0
+        Counts the VM virtual network adapters known by WMI.
         ProtocolIFType  Unknown (0)
                         Other (1)
                         IPv4 (4096)
@@ -236,25 +505,70 @@ class HyperVGNS3VM(BaseGNS3VM):
 
         wql = "SELECT * FROM Msvm_GuestNetworkAdapterConfiguration WHERE InstanceID like \
                'Microsoft:GuestNetwork\\" + self._vm.Name + "%' and ProtocolIFType > 0 "
-        nic_count = len(self._conn.query(wql))
-        while nic_count == 0:
-            await asyncio.sleep(0.1)  # 100ms
-            nic_count = len(self._conn.query(wql))
+        return len(self._conn.query(wql))
+
+    async def _is_vm_network_active(self):
+        """
+        Check if WMI is updated with VM virtual network adapters
+        and wait until their count becomes > 0
+        """
+
+        async def poll():
+            delay = HyperVGNS3VM._POLL_INTERVAL
+            while (await self._wmi_call(self._count_vm_nics)) == 0:
+                await asyncio.sleep(delay)
+                delay = min(delay * 1.5, HyperVGNS3VM._POLL_MAX_INTERVAL)
+
+        try:
+            await asyncio.wait_for(poll(), timeout=HyperVGNS3VM._STATE_CHANGE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise GNS3VMError("Timeout while waiting for the network adapters of {} to be active".format(self.vmname))
+
+    def _get_guest_ip_address(self, ports, vnics):
+        """
+        Gets the guest IP address from the VM network adapters.
+
+        :param ports: VM Ethernet port allocation settings
+        :param vnics: VM synthetic Ethernet port settings
+
+        :returns: IP address or empty string
+        """
+
+        guest_ip_address = ""
+        for port in ports:
+            try:
+                vnic = [v for v in vnics if port.Parent == v.path_()][0]
+            except IndexError:
+                continue
+            config = vnic.associators(wmi_result_class='Msvm_GuestNetworkAdapterConfiguration')
+            ip_addresses = config[0].IPAddresses
+            for ip_address in ip_addresses:
+                # take the first valid IPv4 address
+                try:
+                    ipaddress.IPv4Address(ip_address)
+                    guest_ip_address = ip_address
+                except ipaddress.AddressValueError:
+                    continue
+            if len(ip_addresses):
+                guest_ip_address = ip_addresses[0]
+                break
+        return guest_ip_address
 
     async def start(self):
         """
         Starts the GNS3 VM.
         """
 
-        self._vm = self._find_vm(self.vmname)
+        self._vm = await self._wmi_call(self._find_vm, self.vmname)
         if not self._vm:
             raise GNS3VMError("Could not find Hyper-V VM {}".format(self.vmname))
 
+        await self._watch_vm_state()
         if not self._is_running():
             if self.allocate_vcpus_ram:
                 log.info("Update GNS3 VM settings (CPU and RAM)")
                 # set the number of vCPUs and amount of RAM
-                self._set_vcpus_ram(self.vcpus, self.ram)
+                await self._wmi_call(self._set_vcpus_ram, self.vcpus, self.ram)
 
             # start the VM
             try:
@@ -270,28 +584,11 @@ class HyperVGNS3VM(BaseGNS3VM):
         # LIS (Linux Integration Services) must be installed on the guest
         # See https://oitibs.com/hyper-v-lis-on-ubuntu-18-04/ for details.
         trial = 120
-        guest_ip_address = ""
         log.info("Waiting for GNS3 VM IP")
-        ports = self._get_vm_resources(self._vm, 'Msvm_EthernetPortAllocationSettingData')
-        vnics = self._get_vm_resources(self._vm, 'Msvm_SyntheticEthernetPortSettingData')
+        ports = await self._wmi_call(self._get_vm_resources, self._vm, 'Msvm_EthernetPortAllocationSettingData')
+        vnics = await self._wmi_call(self._get_vm_resources, self._vm, 'Msvm_SyntheticEthernetPortSettingData')
         while True:
-            for port in ports:
-                try:
-                    vnic = [v for v in vnics if port.Parent == v.path_()][0]
-                except IndexError:
-                    continue
-                config = vnic.associators(wmi_result_class='Msvm_GuestNetworkAdapterConfiguration')
-                ip_addresses = config[0].IPAddresses
-                for ip_address in ip_addresses:
-                    # take the first valid IPv4 address
-                    try:
-                        ipaddress.IPv4Address(ip_address)
-                        guest_ip_address = ip_address
-                    except ipaddress.AddressValueError:
-                        continue
-                if len(ip_addresses):
-                    guest_ip_address = ip_addresses[0]
-                    break
+            guest_ip_address = await self._wmi_call(self._get_guest_ip_address, ports, vnics)
             trial -= 1
             if guest_ip_address:
                 break
@@ -325,3 +622,26 @@ class HyperVGNS3VM(BaseGNS3VM):
             raise GNS3VMError("Failed to stop the GNS3 VM: {}".format(e))
         log.info("GNS3 VM has been stopped")
         self.running = False
+
+    def _disconnect(self):
+        """
+        Releases the cached WMI connections and objects.
+        """
+
+        self._conn_cache.clear()
+        self._conn = None
+        self._management = None
+        self._vm = None
+
+    async def close(self):
+        """
+        Closes the cached WMI connections and the WMI thread.
+        """
+
+        await self._stop_vm_state_watcher()
+        if self._wmi_executor is not None:
+            # WMI objects must be released in the thread that created them
+            await self._wmi_call(self._disconnect)
+            # the thread is idle at this point so shutting down does not block
+            self._wmi_executor.shutdown()
+            self._wmi_executor = None
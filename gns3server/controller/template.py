@@ -195,7 +195,8 @@ class Template:
         except jsonschema.ValidationError as e:
             message = "JSON schema error {}".format(e.message)
             log.error(message)
-            log.debug("Input schema: {}".format(json.dumps(schema)))
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Input schema: %s", json.dumps(schema))
             raise
 
     def __json__(self):
@@ -97,10 +97,13 @@ class VPCSHandler:
 
         vpcs_manager = VPCS.instance()
         vm = vpcs_manager.get_node(request.match_info["node_id"], project_id=request.match_info["project_id"])
-        vm.name = request.json.get("name", vm.name)
-        vm.console = request.json.get("console", vm.console)
-        vm.console_type = request.json.get("console_type", vm.console_type)
-        vm.updated()
+        updated = False
+        for name in ("name", "console", "console_type"):
+            if name in request.json and getattr(vm, name) != request.json[name]:
+                setattr(vm, name, request.json[name])
+                updated = True
+        if updated:
+            vm.updated()
         response.json(vm)
 
     @Route.delete(
@@ -17,6 +17,8 @@
 
 import json
 import jsonschema
+import jsonschema.exceptions
+import jsonschema.validators
 import aiohttp
 import aiohttp.web
 import mimetypes
@@ -37,9 +39,10 @@ CHUNK_SIZE = 1024 * 8  # 8KB
 
 class Response(aiohttp.web.Response):
 
-    def __init__(self, request=None, route=None, output_schema=None, headers={}, **kwargs):
+    def __init__(self, request=None, route=None, output_schema=None, output_validator=None, headers={}, **kwargs):
         self._route = route
         self._output_schema = output_schema
+        self._output_validator = output_validator
         self._request = request
         headers['Connection'] = "close"  # Disable keep alive because create trouble with old Qt (5.2, 5.3 and 5.4)
         headers['X-Route'] = self._route
@@ -107,11 +110,12 @@ class Response(aiohttp.web.Response):
                 newanswer.append(elem)
             answer = newanswer
         if self._output_schema is not None:
-            try:
-                jsonschema.validate(answer, self._output_schema)
-            except jsonschema.ValidationError as e:
-                log.error("Invalid output query. JSON schema error: {}".format(e.message))
-                raise aiohttp.web.HTTPBadRequest(text="{}".format(e))
+            if self._output_validator is None:
+                self._output_validator = jsonschema.validators.validator_for(self._output_schema)(self._output_schema)
+            error = jsonschema.exceptions.best_match(self._output_validator.iter_errors(answer))
+            if error is not None:
+                log.error("Invalid output query. JSON schema error: {}".format(error.message))
+                raise aiohttp.web.HTTPBadRequest(text="{}".format(error))
         self.body = json.dumps(answer, indent=4, sort_keys=True).encode('utf-8')
 
     async def stream_file(self, path, status=200, set_content_type=None, set_content_length=True):
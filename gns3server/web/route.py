@@ -23,6 +23,7 @@ import aiohttp
 import traceback
 import jsonschema
 import jsonschema.exceptions
+import jsonschema.validators
 
 from ..compute.error import NodeError, ImageMissingError
 from ..controller.controller_error import ControllerError
@@ -37,7 +38,22 @@ import logging
 log = logging.getLogger(__name__)
 
 
-async def parse_request(request, input_schema, raw):
+def compile_schema(schema):
+    """
+    Returns a validator for a JSON schema, so the schema
+    is checked and compiled only once.
+
+    :param schema: JSON schema
+
+    :returns: jsonschema validator instance
+    """
+
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+async def parse_request(request, input_schema, raw, input_validator=None):
     """Parse body of request and raise HTTP errors in case of problems"""
 
     request.json = {}
@@ -56,14 +72,16 @@ async def parse_request(request, input_schema, raw):
             request.json[k] = v[0]
 
     if input_schema:
-        try:
-            jsonschema.validate(request.json, input_schema)
-        except jsonschema.ValidationError as e:
+        if input_validator is None:
+            input_validator = compile_schema(input_schema)
+        error = jsonschema.exceptions.best_match(input_validator.iter_errors(request.json))
+        if error is not None:
             message = "JSON schema error with API request '{}' and JSON data '{}': {}".format(request.path_qs,
                                                                                               request.json,
-                                                                                              e.message)
+                                                                                              error.message)
             log.error(message)
-            log.debug("Input schema: {}".format(json.dumps(input_schema)))
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Input schema: %s", json.dumps(input_schema))
             raise aiohttp.web.HTTPBadRequest(text=message)
 
     return request
@@ -137,6 +155,8 @@ class Route(object):
         input_schema = kw.get("input", {})
         api_version = kw.get("api_version", 2)
         raw = kw.get("raw", False)
+        input_validator = compile_schema(input_schema) if input_schema else None
+        output_validator = compile_schema(output_schema)
 
         def register(func):
             # Add the type of server to the route
@@ -176,7 +196,7 @@ class Route(object):
                 try:
                     # Non API call
                     if api_version is None or raw is True:
-                        response = Response(request=request, route=route, output_schema=output_schema)
+                        response = Response(request=request, route=route, output_schema=output_schema, output_validator=output_validator)
 
                         request = await parse_request(request, None, raw)
                         if asyncio.iscoroutinefunction(func):
@@ -186,7 +206,7 @@ class Route(object):
                         return response
 
                     # API call
-                    request = await parse_request(request, input_schema, raw)
+                    request = await parse_request(request, input_schema, raw, input_validator)
                     record_file = server_config.get("record")
                     if record_file:
                         try:
@@ -195,7 +215,7 @@ class Route(object):
                                 f.write("\n")
                         except OSError as e:
                             log.warning("Could not write to the record file {}: {}".format(record_file, e))
-                    response = Response(request=request, route=route, output_schema=output_schema)
+                    response = Response(request=request, route=route, output_schema=output_schema, output_validator=output_validator)
                     if asyncio.iscoroutinefunction(func):
                         await func(request, response)
                     else:
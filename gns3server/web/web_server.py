@@ -241,6 +241,28 @@ class WebServer:
         # computing with server start
         asyncio.ensure_future(Qemu.instance().list_images())
 
+    @staticmethod
+    def _set_pidfd_child_watcher(loop):
+        """
+        Uses a pidfd registered with the event loop to be notified when a child
+        process (VPCS, Qemu etc.) exits, instead of having a thread blocking
+        on waitpid() for each process.
+
+        :param loop: event loop used to spawn the child processes
+        """
+
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+        except (AttributeError, OSError):
+            # pidfd_open() requires Linux 5.3 or later
+            return
+        watcher = asyncio.PidfdChildWatcher()
+        # set_child_watcher() does not attach the watcher to a loop and
+        # subprocesses cannot be spawned until the watcher is active
+        watcher.attach_loop(loop)
+        asyncio.set_child_watcher(watcher)
+        log.debug("Using pidfd to monitor child processes")
+
     def run(self):
         """
         Starts the server.
@@ -275,6 +297,10 @@ class WebServer:
 
         self._loop = asyncio.get_event_loop()
 
+        if sys.platform.startswith("linux") and (3, 9) <= sys.version_info < (3, 12):
+            # Python 3.12 and later already use pidfd when it is supported
+            self._set_pidfd_child_watcher(self._loop)
+
         if log.getEffectiveLevel() == logging.DEBUG:
             # On debug version we enable info that
             # coroutine is not called in a way await/await
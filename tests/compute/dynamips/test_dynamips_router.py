@@ -16,9 +16,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import base64
 import uuid
 import pytest
 
+from tests.utils import asyncio_patch
+
 from gns3server.compute.dynamips.nodes.router import Router
 from gns3server.compute.dynamips.dynamips_error import DynamipsError
 from gns3server.compute.dynamips import Dynamips
@@ -74,3 +77,31 @@ async def test_router_invalid_dynamips_path(compute_project, manager):
         await router.create()
         assert router.name == "test"
         assert router.id == "00010203-0405-0607-0809-0a0b0c0d0e0e"
+
+
+async def test_save_configs(router):
+
+    startup_config = base64.b64encode(b"hostname R1\r\ninterface f0/0\r\n description \xff\r\nend\r\n").decode()
+    private_config = base64.b64encode(b"\nkey chain test\nend\n").decode()
+    with asyncio_patch("gns3server.compute.dynamips.nodes.router.Router.extract_config", return_value=(startup_config, private_config)):
+        await router.save_configs()
+    with open(router.startup_config_path, "rb") as f:
+        assert f.read() == b"!\nhostname R1\ninterface f0/0\n description \xff\nend\n"
+    with open(router.private_config_path, "rb") as f:
+        assert f.read() == b"\nkey chain test\nend\n"
+
+
+async def test_save_configs_default_private_config(router):
+
+    startup_config = base64.b64encode(b"hostname R1\r\nend\r\n").decode()
+    private_config = base64.b64encode(b"\nkerberos password \nend\n").decode()
+    os.makedirs(os.path.dirname(router.private_config_path), exist_ok=True)
+    with open(router.private_config_path, "wb") as f:
+        f.write(b"\nkey chain test\nend\n")
+    with asyncio_patch("gns3server.compute.dynamips.nodes.router.Router.extract_config", return_value=(startup_config, private_config)):
+        await router.save_configs()
+    with open(router.startup_config_path, "rb") as f:
+        assert f.read() == b"!\nhostname R1\nend\n"
+    # the default private-config is not saved
+    with open(router.private_config_path, "rb") as f:
+        assert f.read() == b"\nkey chain test\nend\n"
@@ -15,12 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import sys
 import uuid
 import os
 import pytest
 from unittest.mock import patch, MagicMock
 from tests.utils import asyncio_patch
 
+from gns3server.compute.base_manager import BaseManager
 from gns3server.compute.vpcs import VPCS
 from gns3server.compute.dynamips import Dynamips
 from gns3server.compute.qemu import Qemu
@@ -318,3 +320,20 @@ async def test_duplicate_ethernet_switch(compute_project):
         destination_node_id = str(uuid.uuid4())
         await dynamips_manager.create_node("SW-2", compute_project.id, destination_node_id, node_type='ethernet_switch')
         await dynamips_manager.duplicate_node(source_node_id, destination_node_id)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Not supported on this platform")
+def test_has_privileged_access_cached(tmpdir):
+
+    executable = str(tmpdir / "ubridge")
+    open(executable, "w+").close()
+    with patch("os.geteuid", return_value=1000):
+        with patch("gns3server.compute.base_manager.BaseManager._check_privileged_access", return_value=False) as mock:
+            assert BaseManager.has_privileged_access(executable) is False
+            assert BaseManager.has_privileged_access(executable) is False
+            assert mock.call_count == 1
+            # replacing the executable gives it a new inode
+            open(executable + ".new", "w+").close()
+            os.replace(executable + ".new", executable)
+            BaseManager.has_privileged_access(executable)
+            assert mock.call_count == 2
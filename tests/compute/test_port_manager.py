@@ -121,6 +121,14 @@ def test_find_unused_port():
     assert p is not None
 
 
+def test_find_unused_port_skip_banned_ports():
+
+    with patch("gns3server.compute.port_manager.PortManager._check_port") as mock_check:
+        p = PortManager().find_unused_port(6665, 6700)
+        assert p == 6670
+        assert mock_check.call_count == 2
+
+
 def test_find_unused_port_invalid_range():
 
     with pytest.raises(aiohttp.web.HTTPConflict):
@@ -81,6 +81,20 @@ async def test_vm_invalid_vpcs_version(vm, manager):
             assert vm.id == "00010203-0405-0607-0809-0a0b0c0d0e0f"
 
 
+async def test_vm_check_requirements_version_cached(vm, tmpdir):
+
+    vpcs_path = str(tmpdir / "vpcs")
+    open(vpcs_path, "w+").close()
+    os.chmod(vpcs_path, 0o755)
+    with patch("gns3server.compute.vpcs.vpcs_vm.VPCSVM._vpcs_path", return_value=vpcs_path):
+        with asyncio_patch("gns3server.compute.vpcs.vpcs_vm.subprocess_check_output", return_value="Welcome to Virtual PC Simulator, version 0.8.1") as mock:
+            await vm._check_requirements()
+            vm._vpcs_version = None
+            await vm._check_requirements()
+            assert mock.call_count == 1
+            assert vm._vpcs_version == parse_version("0.8.1")
+
+
 async def test_vm_invalid_vpcs_path(vm, manager):
 
     with patch("gns3server.compute.vpcs.vpcs_vm.VPCSVM._vpcs_path", return_value="/tmp/fake/path/vpcs"):
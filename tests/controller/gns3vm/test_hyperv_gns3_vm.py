@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+#
+# Copyright (C) 2020 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from tests.utils import AsyncioMagicMock
+from unittest.mock import patch, MagicMock
+
+from gns3server.controller.gns3vm.hyperv_gns3_vm import HyperVGNS3VM
+from gns3server.controller.gns3vm.gns3_vm_error import GNS3VMError
+
+
+@pytest.fixture
+async def gns3vm(loop, controller):
+
+    vm = HyperVGNS3VM(controller)
+    vm.vmname = "GNS3 VM"
+    vm._vm = MagicMock()
+    vm._management = MagicMock()
+    yield vm
+    await vm.close()
+
+
+def vm_settings(ram, ram_reservation, ram_limit, vcpus, vcpus_reservation, vcpus_limit):
+
+    mem_settings = MagicMock()
+    mem_settings.Path_.Class = "Msvm_MemorySettingData"
+    mem_settings.VirtualQuantity = str(ram)
+    mem_settings.Reservation = str(ram_reservation)
+    mem_settings.Limit = str(ram_limit)
+    cpu_settings = MagicMock()
+    cpu_settings.Path_.Class = "Msvm_ProcessorSettingData"
+    cpu_settings.VirtualQuantity = str(vcpus)
+    cpu_settings.Reservation = str(vcpus_reservation)
+    cpu_settings.Limit = str(vcpus_limit)
+    cpu_settings.ExposeVirtualizationExtensions = True
+    setting_data = MagicMock()
+    setting_data.associators.return_value = [MagicMock(), mem_settings, cpu_settings]
+    return setting_data, mem_settings, cpu_settings
+
+
+def test_split_wmi_path():
+
+    path = '\\\\HOST\\root\\virtualization\\v2:Msvm_ConcreteJob.InstanceID="8A0A4B3F-2B6E-4F1C"'
+    assert HyperVGNS3VM._split_wmi_path(path) == ("root\\virtualization\\v2", 'Msvm_ConcreteJob.InstanceID="8A0A4B3F-2B6E-4F1C"')
+    path = 'root\\cimv2:Win32_Process.Handle="4:2"'
+    assert HyperVGNS3VM._split_wmi_path(path) == ("root\\cimv2", 'Win32_Process.Handle="4:2"')
+
+
+@pytest.mark.parametrize("ret", [0, 32775])
+async def test_set_state_sync_success(gns3vm, ret):
+
+    gns3vm._vm.RequestStateChange.return_value = (None, ret)
+    await gns3vm._set_state(HyperVGNS3VM._HYPERV_VM_STATE_ENABLED)
+    gns3vm._vm.RequestStateChange.assert_called_with(HyperVGNS3VM._HYPERV_VM_STATE_ENABLED)
+    assert gns3vm._is_running()
+
+
+async def test_set_state_failure(gns3vm):
+
+    gns3vm._vm.RequestStateChange.return_value = (None, 32768)
+    with pytest.raises(GNS3VMError):
+        await gns3vm._set_state(HyperVGNS3VM._HYPERV_VM_STATE_ENABLED)
+    assert not gns3vm._is_running()
+
+
+async def test_set_state_job(gns3vm):
+
+    job_path = '\\\\HOST\\root\\virtualization\\v2:Msvm_ConcreteJob.InstanceID="1"'
+    gns3vm._vm.RequestStateChange.return_value = (job_path, HyperVGNS3VM._WMI_JOB_STATUS_STARTED)
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._wait_for_job") as mock:
+        await gns3vm._set_state(HyperVGNS3VM._HYPERV_VM_STATE_SHUTDOWN)
+        assert mock.call_args[0][0] == job_path
+    assert gns3vm._enabled_state == HyperVGNS3VM._HYPERV_VM_STATE_SHUTDOWN
+
+
+async def test_set_vcpus_ram_already_set(gns3vm):
+
+    setting_data, mem_settings, cpu_settings = vm_settings(2048, 2048, 2048, 2, 2, 100000)
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._physical_cpus", 4):
+        with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._get_vm_setting_data", return_value=setting_data):
+            await gns3vm._wmi_call(gns3vm._set_vcpus_ram, 2, 2048)
+    assert not gns3vm._management.ModifyResourceSettings.called
+
+
+async def test_set_vcpus_ram(gns3vm):
+
+    # the quantities match but the CPU is capped
+    setting_data, mem_settings, cpu_settings = vm_settings(2048, 2048, 2048, 2, 2, 50000)
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._physical_cpus", 4):
+        with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._get_vm_setting_data", return_value=setting_data):
+            await gns3vm._wmi_call(gns3vm._set_vcpus_ram, 2, 2048)
+    assert mem_settings.VirtualQuantity == mem_settings.Reservation == mem_settings.Limit == 2048
+    assert cpu_settings.VirtualQuantity == cpu_settings.Reservation == 2
+    assert cpu_settings.Limit == 100000
+    gns3vm._management.ModifyResourceSettings.assert_called_once_with(ResourceSettings=[mem_settings.GetText_.return_value,
+                                                                                         cpu_settings.GetText_.return_value])
+
+
+async def test_set_vcpus_too_many(gns3vm):
+
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._physical_cpus", 4):
+        with pytest.raises(GNS3VMError):
+            await gns3vm._wmi_call(gns3vm._set_vcpus_ram, 8, 2048)
+
+
+async def test_is_vm_network_active_backoff(gns3vm):
+
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._POLL_INTERVAL", 0.01), \
+            patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._POLL_MAX_INTERVAL", 0.02), \
+            patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._count_vm_nics", side_effect=[0, 0, 0, 1]):
+        with patch("asyncio.sleep", new_callable=AsyncioMagicMock) as mock_sleep:
+            await gns3vm._is_vm_network_active()
+    assert [call[0][0] for call in mock_sleep.call_args_list] == [0.01, 0.015, 0.02]
+
+
+async def test_is_vm_network_active_timeout(gns3vm):
+
+    with patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._STATE_CHANGE_TIMEOUT", 0.1), \
+            patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._POLL_INTERVAL", 0.01), \
+            patch("gns3server.controller.gns3vm.hyperv_gns3_vm.HyperVGNS3VM._count_vm_nics", return_value=0):
+        with pytest.raises(GNS3VMError):
+            await gns3vm._is_vm_network_active()
@@ -188,6 +188,20 @@ async def test_vpcs_update(compute_api, vm, free_console_port):
     assert response.json["console"] == console_port
 
 
+async def test_vpcs_update_unchanged(compute_api, vm):
+
+    params = {
+        "name": vm["name"],
+        "console": vm["console"]
+    }
+
+    with patch("gns3server.compute.vpcs.vpcs_vm.VPCSVM.updated") as mock:
+        response = await compute_api.put("/projects/{project_id}/vpcs/nodes/{node_id}".format(project_id=vm["project_id"], node_id=vm["node_id"]), params)
+        assert response.status == 200
+        assert response.json["name"] == vm["name"]
+        assert not mock.called
+
+
 async def test_vpcs_start_capture(compute_api, vm):
 
     params = {
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2020 GNS3 Technologies Inc.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+
+import sys
+import asyncio
+import pytest
+
+from gns3server.web.web_server import WebServer
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux") or not (3, 9) <= sys.version_info < (3, 12),
+                    reason="pidfd child watcher is only used on Linux with Python 3.9 to 3.11")
+async def test_pidfd_child_watcher(loop):
+
+    child_watcher = asyncio.get_child_watcher()
+    try:
+        WebServer._set_pidfd_child_watcher(loop)
+        if not isinstance(asyncio.get_child_watcher(), asyncio.PidfdChildWatcher):
+            pytest.skip("pidfd is not supported by this kernel")
+        process = await asyncio.create_subprocess_exec("true")
+        assert await process.wait() == 0
+    finally:
+        asyncio.set_child_watcher(child_watcher)